@@ -2,6 +2,7 @@
 File-to-Markdown converter service powered by kreuzberg.
 """
 
+import hmac
 import os
 import shutil
 import uuid
@@ -10,6 +11,7 @@ from datetime import timedelta
 from enum import StrEnum
 from pathlib import Path
 
+import anyio.to_thread
 import kreuzberg
 from fastapi import (
     Depends,
@@ -56,8 +58,6 @@ from utils.helper import (
     get_file_type,
     get_image_file_formats,
     get_supported_formats,
-    get_text_encoding,
-    is_text_bytes,
     sanitize_filename,
 )
 from utils.logging_helper import logging_help
@@ -65,6 +65,8 @@ from utils.logging_helper import logging_help
 REQUIRED_KEY = os.getenv("F_API_KEY", "").strip()
 if not REQUIRED_KEY:
     raise RuntimeError("F_API_KEY not set! Server cannot run without it.")
+# Encoded once so the per-request check doesn't re-encode the expected key.
+_REQUIRED_KEY_BYTES = REQUIRED_KEY.encode("utf-8")
 
 CLEANUP_SCHEDULE_ID = "ttl-cleanup-zips"
 
@@ -86,8 +88,12 @@ security = HTTPBearer()
 
 
 async def require_api_key(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    """Check that the required api key matches service key `REQUIRED_KEY`"""
-    if credentials.credentials != REQUIRED_KEY:
+    """Check that the required api key matches service key `REQUIRED_KEY`.
+
+    Uses a constant-time comparison so the check doesn't leak how many
+    leading characters of the key a caller got right.
+    """
+    if not hmac.compare_digest(credentials.credentials.encode("utf-8"), _REQUIRED_KEY_BYTES):
         raise HTTPException(status_code=401, detail="Invalid API key")
 
 
@@ -221,7 +227,9 @@ async def extract(file: UploadFile = File(...)):
         upload_path = run_dir / "upload" / safe_name
         upload_path.parent.mkdir(parents=True)
         with upload_path.open("wb") as f:
-            shutil.copyfileobj(file.file, f)
+            # Spool the upload in a worker thread so large files don't block
+            # the event loop.
+            await anyio.to_thread.run_sync(shutil.copyfileobj, file.file, f)
 
         result_dir = run_dir / "result"
         result = await run_processing(
@@ -277,7 +285,7 @@ async def convert(
         upload_path = run_dir / "upload" / safe_name
         upload_path.parent.mkdir(parents=True)
         with upload_path.open("wb") as f:
-            shutil.copyfileobj(file.file, f)
+            await anyio.to_thread.run_sync(shutil.copyfileobj, file.file, f)
 
         result_dir = run_dir / "result"
         await client.start_workflow(
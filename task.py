@@ -1,12 +1,12 @@
 from __future__ import annotations
 
-import asyncio
 import os
 import shutil
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
 
+import uvloop
 from temporalio import activity, workflow
 from temporalio.client import Client
 from temporalio.common import RetryPolicy
@@ -36,12 +36,9 @@ async def process_file_activity(
 ) -> ProcessResult:
     from utils.processor import process_file_core
 
-    file_bytes = Path(file_path).read_bytes()
-    zip_bytes, headers = await process_file_core(file_bytes, filename)
-    Path(result_dir).mkdir(parents=True, exist_ok=True)
     result_path = Path(result_dir) / "output.zip"
-    result_path.write_bytes(zip_bytes)
-    print(f"result_path={result_path} zip_size={len(zip_bytes)}")
+    headers = await process_file_core(Path(file_path), result_path)
+    print(f"result_path={result_path} zip_size={result_path.stat().st_size}")
     return ProcessResult(result_path=str(result_path), headers=headers)
 
 
@@ -205,4 +202,4 @@ async def main() -> None:
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    uvloop.run(main())
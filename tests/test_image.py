@@ -1,3 +1,6 @@
+import io
+import zipfile
+
 import pytest
 
 
@@ -48,3 +51,9 @@ def test_extract_image_file_file(
     )
 
     assert_markdownfile_content("output/assets/ocr_png_ocr.md", expected_ocr_content, entries)
+
+    # webp is already compressed, so the asset is stored as-is; text assets
+    # are still deflated.
+    with zipfile.ZipFile(io.BytesIO(response.content)) as zf:
+        assert zf.getinfo("output/assets/ocr_png.webp").compress_type == zipfile.ZIP_STORED
+        assert zf.getinfo("output/assets/ocr_png_ocr.md").compress_type == zipfile.ZIP_DEFLATED
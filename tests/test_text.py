@@ -1,3 +1,6 @@
+import io
+import zipfile
+
 import pytest
 
 
@@ -41,6 +44,12 @@ def test_extract_text_file(
         entries,
     )
 
+    # Text entries are deflated (chunks are streamed into the zip as they
+    # are produced, so each entry carries its own compression settings).
+    with zipfile.ZipFile(io.BytesIO(response.content)) as zf:
+        assert zf.getinfo("output/chunks/00001.md").compress_type == zipfile.ZIP_DEFLATED
+        assert zf.getinfo("output/meta.json").compress_type == zipfile.ZIP_DEFLATED
+
 
 @pytest.mark.parametrize(
     "expected_filename",
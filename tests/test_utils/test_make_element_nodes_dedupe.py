@@ -0,0 +1,72 @@
+from types import SimpleNamespace
+
+import pytest
+
+import utils.processor
+from utils.processor import make_element_nodes
+
+
+@pytest.fixture
+def resolved_indices(monkeypatch):
+    """Stub the per-image resolver and record which image indices it sees."""
+    calls: list[int] = []
+
+    async def _fake_resolve(result, assets_dir, image_index):
+        calls.append(image_index)
+        return f"[resolved {image_index}]", False
+
+    monkeypatch.setattr(utils.processor, "_resolve_image_element", _fake_resolve)
+    return calls
+
+
+def _image_element():
+    return {"element_type": "image", "metadata": {}}
+
+
+def _text_element(text):
+    return {"element_type": "text", "text": text, "metadata": {}}
+
+
+async def _collect(elements, result, tmp_path):
+    return [node async for node in make_element_nodes(elements, result, tmp_path)]
+
+
+@pytest.mark.asyncio
+async def test_duplicate_images_resolved_once(tmp_path, resolved_indices):
+    elements = [_image_element(), _text_element("between"), _image_element(), _image_element()]
+    result = SimpleNamespace(images=[{"data": b"logo"}, {"data": b"logo"}, {"data": b"other"}])
+
+    nodes = await _collect(elements, result, tmp_path)
+
+    # Only one resolver call per distinct content; duplicates share the result.
+    assert sorted(resolved_indices) == [0, 2]
+    assert [n.content for n in nodes] == [
+        "[resolved 0]",
+        "between",
+        "[resolved 0]",
+        "[resolved 2]",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_undigestable_images_resolved_individually(tmp_path, resolved_indices):
+    # When the raw bytes are unavailable the digest cannot be computed, so
+    # every such image goes through the resolver (which raises the
+    # user-facing error as before).
+    elements = [_image_element(), _image_element()]
+    result = SimpleNamespace(images=[{"data": None}, {"data": None}])
+
+    await _collect(elements, result, tmp_path)
+
+    assert sorted(resolved_indices) == [0, 1]
+
+
+@pytest.mark.asyncio
+async def test_distinct_images_all_resolved(tmp_path, resolved_indices):
+    elements = [_image_element(), _image_element()]
+    result = SimpleNamespace(images=[{"data": b"a"}, {"data": b"b"}])
+
+    nodes = await _collect(elements, result, tmp_path)
+
+    assert sorted(resolved_indices) == [0, 1]
+    assert [n.content for n in nodes] == ["[resolved 0]", "[resolved 1]"]
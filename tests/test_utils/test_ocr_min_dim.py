@@ -0,0 +1,63 @@
+from types import SimpleNamespace
+
+import pytest
+from PIL import Image
+
+import utils.processor
+from utils.processor import process_image_content
+
+
+@pytest.fixture
+def ocr_calls(monkeypatch):
+    """Stub out the kreuzberg OCR call and record what gets OCRed.
+
+    Also routes the image helpers through the default thread executor so the
+    test does not spawn worker processes.
+    """
+    calls: list[str] = []
+
+    async def _fake_extract_file(path, config=None):
+        calls.append(path)
+        return SimpleNamespace(ocr_elements=[], content="")
+
+    monkeypatch.setattr(utils.processor, "extract_file", _fake_extract_file)
+    monkeypatch.setattr(utils.processor, "_get_process_pool", lambda: None)
+    return calls
+
+
+def _make_image(path, width, height):
+    Image.new("RGB", (width, height), "white").save(path)
+    return path
+
+
+@pytest.mark.asyncio
+async def test_tiny_icon_skips_ocr(tmp_path, ocr_calls):
+    image = _make_image(tmp_path / "icon.png", 32, 32)
+    saved, ocr_string = await process_image_content(image, tmp_path)
+    assert ocr_calls == []
+    assert ocr_string == ""
+    assert saved.suffix == ".webp"
+
+
+@pytest.mark.asyncio
+async def test_wide_text_strip_still_ocrs(tmp_path, ocr_calls):
+    # A cropped single text line: short side below the threshold, but legible.
+    image = _make_image(tmp_path / "strip.png", 200, 32)
+    await process_image_content(image, tmp_path)
+    assert len(ocr_calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_threshold_is_exclusive(tmp_path, ocr_calls):
+    # max(width, height) == OCR_MIN_IMAGE_DIM must still run OCR.
+    image = _make_image(tmp_path / "boundary.png", 64, 10)
+    await process_image_content(image, tmp_path)
+    assert len(ocr_calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_skip_respects_env_override(tmp_path, ocr_calls, monkeypatch):
+    monkeypatch.setenv("OCR_MIN_IMAGE_DIM", "300")
+    image = _make_image(tmp_path / "strip.png", 200, 150)
+    await process_image_content(image, tmp_path)
+    assert ocr_calls == []
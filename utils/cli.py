@@ -2,4 +2,4 @@ import uvicorn
 
 
 def dev():
-    uvicorn.run("main:app", reload=True, host="0.0.0.0", port=8001)
+    uvicorn.run("main:app", reload=True, host="0.0.0.0", port=8001, loop="uvloop")
@@ -1,5 +1,4 @@
 # utils/helper.py
-import os
 import re
 from pathlib import Path, PurePosixPath
 from urllib.parse import quote
@@ -23,6 +22,11 @@ def make_content_disposition(filename_stem: str) -> str:
     # Create the full ZIP filename
     zip_filename = f"{filename_stem}.zip"
 
+    # Fast path: a pure-ASCII name needs no fallback derivation, no URL
+    # encoding and no filename* variant (it would equal the plain filename).
+    if zip_filename.isascii():
+        return f'attachment; filename="{zip_filename}"'
+
     # Create ASCII fallback by removing all non-ASCII characters
     ascii_filename = "".join(char for char in zip_filename if ord(char) < 128)
 
@@ -54,14 +58,34 @@ def make_content_disposition(filename_stem: str) -> str:
     return header
 
 
-def get_supported_formats() -> set[str]:
-    """Supported formats.
+# The list of files to be treated as an image from supported formats.
+_IMAGE_FILE_FORMATS = frozenset(
+    {
+        ".jpg",
+        ".jpeg",
+        ".png",
+        ".gif",
+        ".bmp",
+        ".webp",
+        ".tif",
+        ".tiff",
+        ".jp2",
+        ".j2k",
+        ".jpx",
+        ".jpm",
+        ".mj2",
+        ".pbm",
+        ".pgm",
+        ".ppm",
+        ".pnm",
+    }
+)
 
-    Supported formats are not available dynamically via python api and
-    currently need to be extracted statically by running rust.
-    Example see: https://github.com/kreuzberg-dev/kreuzberg/blob/v4.8.5/crates/kreuzberg/src/core/mime.rs#L877-L903
-    """
-    return {
+# Supported formats are not available dynamically via python api and
+# currently need to be extracted statically by running rust.
+# Example see: https://github.com/kreuzberg-dev/kreuzberg/blob/v4.8.5/crates/kreuzberg/src/core/mime.rs#L877-L903
+_SUPPORTED_FORMATS = frozenset(
+    {
         ".7z",
         ".bib",
         ".bmp",
@@ -158,31 +182,19 @@ def get_supported_formats() -> set[str]:
         ".yaml",
         ".yml",
         ".zip",
-        *get_image_file_formats()
     }
+    | _IMAGE_FILE_FORMATS
+)
 
 
-def get_image_file_formats():
+def get_supported_formats() -> frozenset[str]:
+    """Supported formats."""
+    return _SUPPORTED_FORMATS
+
+
+def get_image_file_formats() -> frozenset[str]:
     """The list of files to be treated as an image from supported formats."""
-    return {
-        ".jpg",
-        ".jpeg",
-        ".png",
-        ".gif",
-        ".bmp",
-        ".webp",
-        ".tif",
-        ".tiff",
-        ".jp2",
-        ".j2k",
-        ".jpx",
-        ".jpm",
-        ".mj2",
-        ".pbm",
-        ".pgm",
-        ".ppm",
-        ".pnm",
-    }
+    return _IMAGE_FILE_FORMATS
 
 
 def get_file_type(filename: str) -> str | None:
@@ -192,7 +204,7 @@ def get_file_type(filename: str) -> str | None:
 
     ext = Path(filename).suffix.lower()
 
-    if ext not in get_supported_formats():
+    if ext not in _SUPPORTED_FORMATS:
         return
 
     return ext
@@ -205,7 +217,7 @@ def is_image(file: UploadFile) -> bool:
 
 def is_image_filename(filename: str | None) -> bool:
     """Check if the filename is a readable image format."""
-    return get_file_type(filename) in get_image_file_formats()
+    return get_file_type(filename) in _IMAGE_FILE_FORMATS
 
 
 def sanitize_filename(filename: str) -> str:
@@ -257,5 +269,5 @@ def is_text_bytes(data: bytes) -> bool:
     try:
         sample.decode(best.encoding)
         return True
-    except UnicodeDecodeError, LookupError:
+    except (UnicodeDecodeError, LookupError):
         return False
@@ -1,6 +1,9 @@
+import atexit
 import logging
 import os
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
+from queue import SimpleQueue
 
 
 def logging_help(log_path: str | os.PathLike = "conversion.log") -> logging.Logger:
@@ -9,6 +12,9 @@ def logging_help(log_path: str | os.PathLike = "conversion.log") -> logging.Logg
       1. A file which can be specified in log path
       2. Standard output in console
 
+    Records are handed off through a QueueHandler and written by a background
+    QueueListener thread, so request handlers never block on file writes.
+
     This logger is process-safe for FastAPI/Uvicorn reloads and avoids duplicate handlers.
     """
 
@@ -25,8 +31,14 @@ def logging_help(log_path: str | os.PathLike = "conversion.log") -> logging.Logg
         fmt = logging.Formatter("%(asctime)s [%(levelname)s] %(name)s: %(message)s")
         fh.setFormatter(fmt)
         sh.setFormatter(fmt)
-        logger.addHandler(fh)
-        logger.addHandler(sh)
+
+        # The logger only enqueues; the listener thread does the actual I/O.
+        queue: SimpleQueue = SimpleQueue()
+        logger.addHandler(QueueHandler(queue))
+        listener = QueueListener(queue, fh, sh, respect_handler_level=True)
+        listener.start()
+        # Drain pending records on interpreter shutdown.
+        atexit.register(listener.stop)
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
     logging.getLogger("uvicorn.error").setLevel(logging.INFO)
     return logger